@@ -9,16 +9,19 @@ import os
 # Add source directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'source'))
 
+import argparse
+import json
+from dataclasses import dataclass
+from typing import Tuple
 import yaml
 from core import Clock
 from park.arrival import ArrivalGenerator
 from park.park import Park
 from park.maintenance import MaintenanceDaemon
-from facilities.ride import Ride
+from park.scheduler import Scheduler
 from facilities.queues import RideQueue, ServiceQueue
 from facilities.food import BurgerTruck, IceCreamStand
 from metrics_recorder import MetricsRecorder
-import inspect
 from facilities import ride_instances
 
 
@@ -32,48 +35,74 @@ class IdGenerator:
         return self._visitor_id
 
 
+@dataclass(frozen=True, slots=True)
+class FoodCfg:
+    """One `food:` entry from park.yaml, parsed once at build time."""
+    name: str
+    service_time: Tuple[int, int]
+    capacity: int
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "FoodCfg":
+        return cls(d["name"], tuple(d["service_time"]), int(d["capacity"]))
+
+
+def load_config(path: str) -> dict:
+    """
+    Load the park configuration, reusing a JSON sidecar (`<path>.json`)
+    while it is at least as new as the YAML file.
+    """
+    cache_path = path + ".json"
+    try:
+        if os.path.getmtime(cache_path) >= os.path.getmtime(path):
+            with open(cache_path) as f:
+                return json.load(f)
+    except (OSError, ValueError):
+        # missing or corrupt cache: fall back to parsing the YAML
+        pass
+
+    # Prefer the libyaml-backed loader when PyYAML was built with it
+    Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(path) as f:
+        cfg = yaml.load(f, Loader=Loader)
+
+    try:
+        with open(cache_path, "w") as f:
+            json.dump(cfg, f)
+    except (OSError, TypeError):
+        pass
+    return cfg
+
+
 def build_park_from_config(cfg: dict, clock: Clock, metrics: MetricsRecorder) -> Park:
     """Build the Park object with all rides from configuration."""
     park = Park(clock, metrics)
     
-    # Instantiate all rides defined in source/facilities/ride_instances.py
+    # Instantiate all rides registered in source/facilities/ride_instances.py
     # (ignore YAML `rides` entries; all rides will come from the ride_instances module)
-    park.rides = []
     fastpass_enabled = cfg.get("policy", {}).get("fastpass", False)
     queue_capacity = 100
 
-    for name, obj in inspect.getmembers(ride_instances, inspect.isclass):
-        try:
-            if issubclass(obj, Ride) and obj is not Ride:
-                queue = RideQueue(
-                    support_priority=fastpass_enabled,
-                    max_regular=queue_capacity,
-                    max_priority=queue_capacity // 2 if fastpass_enabled else None
-                )
-                # ride_instances classes expect (queue, clock, metrics=None)
-                ride = obj(queue, clock, metrics)
-                park.rides.append(ride)
-        except Exception:
-            # skip anything that isn't compatible with the expected constructor
-            continue
+    for ride_cls in ride_instances.RIDE_REGISTRY:
+        queue = RideQueue(
+            support_priority=fastpass_enabled,
+            max_regular=queue_capacity,
+            max_priority=queue_capacity // 2 if fastpass_enabled else None
+        )
+        # ride_instances classes expect (queue, clock, metrics=None)
+        park.add_ride(ride_cls(queue, clock, metrics))
     
     # Create food facilities
-    food_cfg = cfg.get("food", [])
+    food_cfg = [FoodCfg.from_dict(f) for f in cfg.get("food", [])]
     park.food_facilities = []
     
     for f_cfg in food_cfg:
-        name = f_cfg["name"]
-        service_time = tuple(f_cfg["service_time"])
-        capacity = f_cfg["capacity"]
-        
         # Create queue for food facility
-        food_queue = ServiceQueue(max_size=capacity * 2)
+        food_queue = ServiceQueue(max_size=f_cfg.capacity * 2)
         
         # Create appropriate food facility
-        if "Burger" in name:
-            facility = BurgerTruck(name, service_time, capacity, food_queue, clock, metrics)
-        else:
-            facility = IceCreamStand(name, service_time, capacity, food_queue, clock, metrics)
+        facility_cls = BurgerTruck if "Burger" in f_cfg.name else IceCreamStand
+        facility = facility_cls(f_cfg.name, f_cfg.service_time, f_cfg.capacity, food_queue, clock, metrics)
         
         park.food_facilities.append(facility)
     
@@ -82,14 +111,18 @@ def build_park_from_config(cfg: dict, clock: Clock, metrics: MetricsRecorder) ->
 
 def main():
     """Main simulation entry point."""
+    parser = argparse.ArgumentParser(description="Amusement park simulation")
+    parser.add_argument("--virtual", action="store_true",
+                        help="run simulated time as fast as possible (ignore speed_factor)")
+    args = parser.parse_args()
+
     print("🎢 Starting Amusement Park Simulation...")
     
     # Load configuration
-    with open("Config/park.yaml") as f:
-        cfg = yaml.safe_load(f)
+    cfg = load_config("Config/park.yaml")
     
     # Initialize core components
-    clock = Clock(cfg["time"]["speed_factor"], cfg["time"]["open_minutes"])
+    clock = Clock(cfg["time"]["speed_factor"], cfg["time"]["open_minutes"], virtual=args.virtual)
     ids = IdGenerator()
     metrics = MetricsRecorder()
     
@@ -105,6 +138,11 @@ def main():
         mean_repair=maint_cfg.get("mean_repair", 10)
     )
     
+    # One scheduler drives every ride, food facility, visitor, arrivals and maintenance
+    scheduler = Scheduler(clock)
+    for facility in (*park.rides, *park.food_facilities):
+        scheduler.add(facility)
+
     # Create arrival generator
     a_cfg = cfg["arrival"]
     arrival = ArrivalGenerator(
@@ -115,20 +153,26 @@ def main():
         total_visitors=a_cfg["total_visitors"],
         curve_points=a_cfg["curve_points"],
         visitor_mix=a_cfg["visitor_types"],
+        scheduler=scheduler,
     )
-    
+
+    # Maintenance and arrivals are minute-driven too, so they run on the
+    # scheduler and never miss a minute
+    scheduler.add(maintenance)
+    scheduler.add(arrival)
+
     # Collect all threads
     all_threads = [
-        arrival,
-        maintenance,
-        *park.rides,
-        *park.food_facilities,
+        scheduler,
     ]
     
     print(f"📊 Park setup complete:")
     print(f"  - {len(park.rides)} rides")
     print(f"  - {len(park.food_facilities)} food facilities")
-    print(f"  - Speed factor: {cfg['time']['speed_factor']} (1 sim min = {clock.seconds_per_minute():.2f} real sec)")
+    if clock.is_virtual():
+        print("  - Speed factor: virtual (no real-time pacing)")
+    else:
+        print(f"  - Speed factor: {cfg['time']['speed_factor']} (1 sim min = {clock.seconds_per_minute():.2f} real sec)")
     print(f"  - Operating hours: {cfg['time']['open_minutes']} simulated minutes")
     print("\n🚀 Starting simulation threads...\n")
     
@@ -2,7 +2,9 @@
 import threading
 import time
 import random
+from bisect import bisect_right
 from enum import Enum
+from itertools import accumulate
 
 
 # ---------- Clock (controls simulated time) ----------
@@ -11,35 +13,80 @@ class Clock:
     Simulated clock for the park.
     - speed_factor: how fast simulated minutes pass (in real seconds)
     - open_minutes: total simulation duration in simulated minutes
+    - virtual: run without real-time pacing (also implied by speed_factor <= 0).
+      Either way only run_until_close advances time; sleep_minutes just
+      waits for it, and a follower (the scheduler) can hold the clock at a
+      minute until it has handled it.
     """
 
-    def __init__(self, speed_factor: float = 0.3, open_minutes: int = 600):
+    def __init__(self, speed_factor: float = 0.3, open_minutes: int = 600, virtual: bool = False):
         self._speed = max(speed_factor, 0.001)  # prevent zero or negative
         self._open_minutes = open_minutes
         self._now = 0
         self._stop = threading.Event()
+        self._virtual = virtual or speed_factor <= 0
+        self._tick = threading.Condition()  # notified on every minute and every hold/release
+        self._release = None  # with a follower: run_until_close may advance up to this minute
 
     def now(self) -> int:
         """Return the current simulated minute."""
         return self._now
 
     def sleep_minutes(self, minutes: int):
-        """Sleep for a number of simulated minutes (scaled by speed)."""
-        for _ in range(minutes):
-            if self._stop.is_set(): #check if someone has asked the simulation to stop
-                return
-            time.sleep(self._speed)
-            self._now += 1
+        """
+        Sleep for a number of simulated minutes. Only waits: the minutes are
+        advanced by run_until_close.
+        """
+        with self._tick:
+            target = self._now + minutes
+            self._tick.wait_for(lambda: self._now >= target or self.should_stop())
+
+    # ---- follower (the scheduler) ----
+    def release_until(self, minute):
+        """
+        Let run_until_close advance freely up to `minute`, then wait for the
+        follower to release it again. The first call makes the caller the
+        follower, so a minute it still has to handle is never skipped.
+        """
+        with self._tick:
+            self._release = minute
+            self._tick.notify_all()
+
+    def hold_at(self, minute: int):
+        """Something for the follower is due at `minute`: don't advance past it."""
+        with self._tick:
+            if self._release is not None and minute < self._release:
+                self._release = max(minute, self._now)
+                self._tick.notify_all()
+
+    def wait_released(self):
+        """Follower side: wait until the clock reaches the released minute (or stops)."""
+        with self._tick:
+            self._tick.wait_for(lambda: self._now >= self._release or self.should_stop())
 
     def run_until_close(self):
-        """Run until closing time."""
-        while self._now < self._open_minutes and not self._stop.is_set():
-            time.sleep(self._speed)
-            self._now += 1
+        """Run until closing time. The only place simulated time advances."""
+        while not self.should_stop():
+            if not self._virtual:
+                time.sleep(self._speed)
+            with self._tick:
+                self._tick.wait_for(
+                    lambda: self._release is None or self._now < self._release or self._stop.is_set()
+                )
+                if self.should_stop():
+                    return
+                self._now += 1
+                self._tick.notify_all()
 
     def stop(self):
         """Stop the simulation clock."""
         self._stop.set()
+        with self._tick:
+            self._tick.notify_all()
+
+    def is_virtual(self) -> bool:
+        """True when simulated time is not paced by the wall clock."""
+        return self._virtual
 
     def should_stop(self) -> bool:
         """Check if the clock or simulation should stop."""
@@ -62,16 +109,31 @@ class Status(Enum):
 def pick_weighted(items, weights):
     """
     Pick a random item from a list with weighted probabilities.
+    If every weight is zero, the last item is returned (same as make_picker).
     Example:
         pick_weighted(['A', 'B', 'C'], [0.6, 0.3, 0.1])
     """
-    total = sum(weights)
-    r = random.random() * total
-    upto = 0
-    for item, w in zip(items, weights):
-        upto += w
-        if r <= upto:
-            return item
-    return items[-1]
+    cum = list(accumulate(weights))
+    if cum[-1] <= 0:
+        return items[-1]
+    return random.choices(items, cum_weights=cum)[0]
 
 
+def make_picker(items, weights):
+    """
+    Precompute cumulative weights once and return a zero-argument picker.
+    Use this instead of pick_weighted when the same weights are sampled repeatedly.
+    Like pick_weighted, all-zero weights always pick the last item.
+    Example:
+        pick = make_picker(['A', 'B', 'C'], [0.6, 0.3, 0.1])
+        pick()  # -> 'A' most of the time
+    """
+    items = list(items)
+    cum = list(accumulate(weights))
+    total = cum[-1]
+    hi = len(items) - 1
+
+    def pick():
+        # a zero total bisects past the end, which the clamp turns into items[-1]
+        return items[min(bisect_right(cum, random.random() * total), hi)]
+    return pick
@@ -1,23 +1,44 @@
 
-# Each facility runs as a thread, serving multiple visitors in parallel.
+# Each facility is ticked once per simulated minute by the park's Scheduler,
+# serving multiple visitors in parallel.
 
 from __future__ import annotations
+import heapq
 import random
 import threading
-from dataclasses import dataclass
-from typing import Optional, List, Any
+from dataclasses import dataclass, field
+from typing import Optional, List, Any, ClassVar
 
 
-@dataclass
+@dataclass(order=True, slots=True)
 class InFlightOrder:
-    visitor: Any
+    # ordered by eta_minute only, so orders can live in a heap
+    visitor: Any = field(compare=False)
     eta_minute: int
 
+    # recycled orders, shared by all facilities (list.append/pop are atomic)
+    _pool: ClassVar[List["InFlightOrder"]] = []
+    POOL_MAX: ClassVar[int] = 256
 
-class BaseFoodFacility(threading.Thread):
+    @classmethod
+    def acquire(cls, visitor, eta_minute) -> "InFlightOrder":
+        try:
+            order = cls._pool.pop()
+        except IndexError:
+            return cls(visitor=visitor, eta_minute=eta_minute)
+        order.visitor = visitor
+        order.eta_minute = eta_minute
+        return order
+
+    def release(self) -> None:
+        self.visitor = None
+        if len(InFlightOrder._pool) < InFlightOrder.POOL_MAX:
+            InFlightOrder._pool.append(self)
+
+
+class BaseFoodFacility:
     def __init__(self, name: str, service_time: tuple[int, int], capacity: int,
-                 order_queue, clock, metrics: Optional[Any] = None, daemon=True):
-        super().__init__(daemon=daemon)
+                 order_queue, clock, metrics: Optional[Any] = None):
         self.name = name
         self.min_service, self.max_service = service_time
         self.capacity = capacity
@@ -25,49 +46,61 @@ class BaseFoodFacility(threading.Thread):
         self.clock = clock
         self.metrics = metrics
         self._lock = threading.Lock()
-        self._inflight: List[InFlightOrder] = []
+        self._rng = random.Random()  # per-facility RNG: cook times keep their own stream
+        self._inflight: List[InFlightOrder] = []  # min-heap by eta_minute
+        self._events: List[tuple] = []  # order/served metrics, flushed once per tick
 
     def _start_order(self, visitor, now_minute):
-        cook_time = random.randint(self.min_service, self.max_service)
+        cook_time = self._rng.randrange(self.min_service, self.max_service + 1)
         eta = now_minute + cook_time
-        self._inflight.append(InFlightOrder(visitor=visitor, eta_minute=eta))
+        heapq.heappush(self._inflight, InFlightOrder.acquire(visitor, eta))
         if self.metrics:
-            try:
-                visitor_id = getattr(visitor, 'vid', getattr(visitor, 'id', None))
-                self.metrics.record_order(visitor_id, self.name, now_minute)
-            except Exception:
-                pass
+            visitor_id = getattr(visitor, 'vid', getattr(visitor, 'id', None))
+            self._events.append(("order", visitor_id, self.name, now_minute))
 
     def _finish_orders(self, now_minute):
-        finished = [o for o in self._inflight if o.eta_minute <= now_minute]
-        self._inflight = [o for o in self._inflight if o.eta_minute > now_minute]
-        for order in finished:
+        # only the orders that are actually due are touched
+        while self._inflight and self._inflight[0].eta_minute <= now_minute:
+            order = heapq.heappop(self._inflight)
             try:
-                if hasattr(order.visitor, "on_food_served"):
-                    order.visitor.on_food_served(self.name, now_minute)
+                # every visitor implements on_food_served (Visitor base class)
+                order.visitor.on_food_served(self.name, now_minute)
             except Exception:
                 pass
             if self.metrics:
-                try:
-                    visitor_id = getattr(order.visitor, 'vid', getattr(order.visitor, 'id', None))
-                    self.metrics.record_served(visitor_id, self.name, now_minute)
-                except Exception:
-                    pass
-
-    def run(self):
-        while not self.clock.should_stop():
-            now = self.clock.now()
-            with self._lock:
-                self._finish_orders(now)
-                slots = self.capacity - len(self._inflight)
-                for _ in range(slots):
-                    item = self.queue.get_next(block=False, clock=self.clock)
-                    if not item:
-                        break
-                    visitor = getattr(item, "obj", item)
-                    self._start_order(visitor, now)
-            self.clock.sleep_minutes(1)
-        self._finish_orders(self.clock.now())
+                visitor_id = getattr(order.visitor, 'vid', getattr(order.visitor, 'id', None))
+                self._events.append(("served", visitor_id, self.name, now_minute))
+            order.release()
+
+    def _flush_events(self):
+        if not self._events:
+            return
+        events, self._events = self._events, []
+        self.metrics.record_batch(events)
+
+    def tick(self, now) -> int:
+        """
+        One simulated minute: hand out finished orders, then start new ones.
+        Returns the minute to be ticked again.
+        """
+        with self._lock:
+            self._finish_orders(now)
+            slots = self.capacity - len(self._inflight)
+            # take every customer that fits in one queue lock acquisition
+            for item in self.queue.get_batch(slots):
+                visitor = getattr(item, "obj", item)
+                release = getattr(item, "release", None)
+                if release:
+                    release()  # pooled QueueItem, no longer needed
+                self._start_order(visitor, now)
+            self._flush_events()
+        return now + 1
+
+    def shutdown(self, now):
+        """Serve whatever is done cooking when the park closes."""
+        with self._lock:
+            self._finish_orders(now)
+            self._flush_events()
 
 
 # Specific Facilities
@@ -1,28 +1,44 @@
 import threading
+from collections import OrderedDict
+
+_MISSING = object()  # pop() default, so a stored None still counts as found
 
 # General class to handle queues for the different extra features that we have (bathrooms, Bars,...)
 # By using this class we are making sure that the critical areas are coded correctly and thus our future code will be easier.
 class Queue:
     def __init__(self) -> None:
         # Two internal queues: priority (fast pass) and regular
-        self.priority = []
-        self.regular = []
+        # Each maps id(person) -> person in FIFO order, so removal is O(1)
+        # (keyed by identity like queues.RideQueue: equal ids or names stay separate)
+        self.priority = OrderedDict()
+        self.regular = OrderedDict()
         self.lock = threading.Lock()
 
-    # person can be any object (id, dict, etc.)
+    @staticmethod
+    def _take(lane, n):
+        # pop the first n people; a fully drained lane is copied and cleared at once
+        if n >= len(lane):
+            people = list(lane.values())
+            lane.clear()
+            return people
+        return [lane.popitem(last=False)[1] for _ in range(n)]
+
+    # person can be any object (id, dict, etc.); the same object added twice keeps its first place
     def add_person(self, person, fast_pass: bool = False):
+        key = id(person)
         with self.lock:
+            if key in self.priority or key in self.regular:
+                return
             if fast_pass:
-                self.priority.append(person)
+                self.priority[key] = person
             else:
-                self.regular.append(person)
+                self.regular[key] = person
 
     def remove_person(self, person):
+        key = id(person)
         with self.lock:
-            if person in self.priority:
-                self.priority.remove(person)
-            elif person in self.regular:
-                self.regular.remove(person)
+            if self.priority.pop(key, _MISSING) is _MISSING:
+                self.regular.pop(key, None)
 
     # ---- Metrics ----
     def total_length(self):
@@ -38,8 +54,9 @@ class Queue:
             return len(self.regular)
 
     def check_person_in(self, person):
+        key = id(person)
         with self.lock:
-            return person in self.priority or person in self.regular
+            return key in self.priority or key in self.regular
 
     # ---- Batch for a ride ----
     def get_batch_for_ride(self, wagon_capacity: int):
@@ -56,14 +73,12 @@ class Queue:
 
             # First: up to 5 from priority (or less if not enough / small capacity)
             num_from_priority = min(5, wagon_capacity, len(self.priority))
-            for _ in range(num_from_priority):
-                batch.append(self.priority.pop(0))
+            batch.extend(self._take(self.priority, num_from_priority))
 
             remaining_slots = wagon_capacity - len(batch)
 
             # Then: fill remaining slots from regular
             num_from_regular = min(remaining_slots, len(self.regular))
-            for _ in range(num_from_regular):
-                batch.append(self.regular.pop(0))
+            batch.extend(self._take(self.regular, num_from_regular))
 
             return batch
@@ -1,17 +1,56 @@
 # source/facilities/queues.py
 from __future__ import annotations
 import threading
-from collections import deque #ton add and remove elements on both sides 
+import time
+from collections import OrderedDict #FIFO order + O(1) removal by key
 from dataclasses import dataclass
-from typing import Deque, Iterable, List, Optional
+from typing import Iterable, List, Optional
 
 
 class QueueItem:
+    __slots__ = ("obj", "enq_minute", "priority")
+
+    # Recycled items. One shared free list: enqueue and release both happen
+    # on the scheduler thread, and list.append/pop are atomic anyway, so no
+    # lock is needed.
+    _pool: List["QueueItem"] = []
+    POOL_MAX = 1024
+
     def __init__(self, obj, enq_minute, priority):
         self.obj = obj                      #visitor instance
         self.enq_minute = enq_minute        #minutes of when they joined the queue
         self.priority = priority            #Fast pass or regular, true means fast pass 
 
+    @classmethod
+    def acquire(cls, obj, enq_minute, priority) -> "QueueItem":
+        """Reuse a released item if one is available, else allocate."""
+        try:
+            item = cls._pool.pop()
+        except IndexError:
+            return cls(obj, enq_minute, priority)
+        item.obj = obj
+        item.enq_minute = enq_minute
+        item.priority = priority
+        return item
+
+    def release(self) -> None:
+        """Hand the item back once nobody reads it any more."""
+        self.obj = None                     #don't keep the visitor alive
+        if len(QueueItem._pool) < QueueItem.POOL_MAX:
+            QueueItem._pool.append(self)
+
+def _drain(lane: "OrderedDict[int, QueueItem]", n: int) -> List[QueueItem]:
+    """Pop up to n items from the front of a lane, in FIFO order."""
+    if n <= 0 or not lane:
+        return []
+    if n >= len(lane):
+        # whole lane boards: copy the values in one go instead of popping each
+        items = list(lane.values())
+        lane.clear()
+        return items
+    return [lane.popitem(last=False)[1] for _ in range(n)]
+
+
 class RideQueue:
     """
     Thread-safe queue for rides with optional priority lane and fair batch boarding.
@@ -31,9 +70,11 @@ class RideQueue:
         self.support_priority = support_priority #If it has fast pass 
         self._lock = threading.Lock() #protects all queues 
         self._not_empty = threading.Condition(self._lock) #wait until so enqueues and notifies rides 
+        self._on_nonempty = None #one-shot callback for the next enqueue (parked ride)
 
-        self._reg: Deque[QueueItem] = deque() #create the empty queue
-        self._pri: Deque[QueueItem] = deque()
+        # lanes are keyed by id(visitor) so abandoning the queue is O(1)
+        self._reg: "OrderedDict[int, QueueItem]" = OrderedDict() #create the empty queue
+        self._pri: "OrderedDict[int, QueueItem]" = OrderedDict()
 
         #Set the capacity limits 
         self._max_regular = max_regular
@@ -41,39 +82,56 @@ class RideQueue:
 
     # ----------------------- Query helpers -----------------------
 
-    #acquire lock to read the length 
+    #lengths are read without the lock: len() of a dict is atomic, and a
+    #snapshot that is one item stale is fine for routing and metrics
     def size(self) -> int:
-        with self._lock:
-            return len(self._reg) + len(self._pri)
+        """Snapshot of the total number of people waiting."""
+        return len(self._reg) + len(self._pri)
 
     def len_regular(self) -> int:
-        with self._lock:
-            return len(self._reg)
+        """Snapshot of the regular lane length."""
+        return len(self._reg)
 
     def len_priority(self) -> int:
+        """Snapshot of the priority lane length."""
+        return len(self._pri)
+
+    def notify_when_nonempty(self, callback) -> bool:
+        """
+        If the queue is empty, remember callback() to be called once by the next
+        enqueue and return True. Returns False (and keeps nothing) otherwise.
+        """
         with self._lock:
-            return len(self._pri)
+            if self._reg or self._pri:
+                return False
+            self._on_nonempty = callback
+            return True
 
     # ----------------------- Core operations -----------------------
 
     def enqueue(self, obj, now_minute: int, priority: bool = False) -> bool:
         """
         Try to put obj in the queue.
-        Returns True if queued, False if rejected due to capacity.
+        Returns True if queued (or already waiting in this queue),
+        False if rejected due to capacity.
         """
-        item = QueueItem(obj=obj, enq_minute=now_minute, priority=priority) #creates the item to be enqueued 
+        key = id(obj)
 
         with self._lock:
+            if key in self._reg or key in self._pri:
+                return True #already in line, keep the original place
             if priority and self.support_priority:
                 if self._max_priority is not None and len(self._pri) >= self._max_priority: #check capaicty and enqueue
                     return False
-                self._pri.append(item)
+                lane = self._pri
             else:
                 if self._max_regular is not None and len(self._reg) >= self._max_regular:
                     return False
-                self._reg.append(item) #enqueue to regular 
+                lane = self._reg #enqueue to regular 
+            lane[key] = QueueItem.acquire(obj, now_minute, priority) #creates the item to be enqueued 
 
             self._not_empty.notify() #wake a ride thread that is waiting for arrival
+            wake, self._on_nonempty = self._on_nonempty, None
 
             # record metrics (commented out - metrics handled at ride level)
             # if self.metrics:
@@ -88,28 +146,21 @@ class RideQueue:
             #     except Exception:
             #         pass
 
-            return True #if teh item was enqueued 
+        if wake is not None:
+            wake() #outside the lock: it schedules the parked ride
+        return True #if teh item was enqueued 
 
     def remove(self, obj, now_minute=None):
         """
-        Remove the first matching obj from either lane.
+        Remove obj from whichever lane holds it.
         Returns True if something was removed.
-        O(n) but queues are typically not huge.
         """
+        key = id(obj)
         with self._lock:
-            for i, it in enumerate(self._reg):
-                if it.obj is obj:
-                    self._rotate_remove(self._reg, i)
-                    removed = True
-                    break
-            else:
-                for i, it in enumerate(self._pri):
-                    if it.obj is obj:
-                        self._rotate_remove(self._pri, i)
-                        removed = True
-                        break
-                else:
-                    removed = False
+            item = self._reg.pop(key, None) or self._pri.pop(key, None)
+        removed = item is not None
+        if removed:
+            item.release()
 
         # Metrics handled at ride level
         # if removed and self.metrics and now_minute is not None:
@@ -124,18 +175,13 @@ class RideQueue:
         #         pass
         return removed
 
-    def _rotate_remove(self, dq: Deque[QueueItem], index: int) -> None:
-        
-        dq.rotate(-index)       #bring the target to the left 
-        dq.popleft()            #pop it 
-        dq.rotate(index)        #restore the original order
-
     # ----------------------- Ride boarding -----------------------
 
     def wait_until_not_empty(self, clock, timeout_minutes: Optional[int] = None) -> bool:
         """
         Block (scaled by simulated time) until there is at least one item or timeout.
-        Every simulated minute, the thread wakes up, re-acquires the lock, and checks if someone arrived
+        Without a timeout the thread wakes every simulated minute; with one it waits
+        on a single real-time deadline and is woken early by enqueue().
         Returns True if queue is non-empty; False if timed out.
         """
         with self._lock:
@@ -148,18 +194,21 @@ class RideQueue:
                     # caller should also check clock.should_stop()
                 return True
             else:
-                # Convert sim minutes to real seconds via seconds_per_minute
-                remaining = timeout_minutes
-                while remaining > 0 and not (self._reg or self._pri):
-                    wait_s = min(1, remaining) * clock.seconds_per_minute()
-                    self._not_empty.wait(timeout=wait_s)
-                    remaining -= 1
+                # Convert sim minutes to an absolute real-time deadline; enqueue()
+                # notifies us early, so there is no need to wake every minute
+                deadline = time.monotonic() + timeout_minutes * clock.seconds_per_minute()
+                while not (self._reg or self._pri):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._not_empty.wait(timeout=remaining)
                 return bool(self._reg or self._pri)
 
     def get_batch_for_boarding(self, capacity: int) -> List[QueueItem]:
         """
         Pop up to `capacity` items for the next ride cycle using fairness rule.
         Non-blocking; returns empty list if nothing to board.
+        The caller owns the items and should release() them when done.
         """
         if capacity <= 0:
             return []
@@ -169,15 +218,13 @@ class RideQueue:
 
             # 1) Take 1 from priority if available
             if self.support_priority and self._pri:
-                taken.append(self._pri.popleft())
+                taken.append(self._pri.popitem(last=False)[1])
 
             # 2) Fill remainder from regular lane
-            while len(taken) < capacity and self._reg:
-                taken.append(self._reg.popleft())
+            taken.extend(_drain(self._reg, capacity - len(taken)))
 
             # 3) If seats remain, take more from priority
-            while len(taken) < capacity and self._pri:
-                taken.append(self._pri.popleft())
+            taken.extend(_drain(self._pri, capacity - len(taken)))
 
             return taken
 
@@ -195,49 +242,55 @@ class ServiceQueue:
     def __init__(self, max_size: Optional[int] = None):
         self._lock = threading.Lock()
         self._not_empty = threading.Condition(self._lock)
-        self._q: Deque[QueueItem] = deque()
+        self._q: "OrderedDict[int, QueueItem]" = OrderedDict() # keyed by id(visitor)
         self._max_size = max_size
 
     # ---------- basic info ----------
     def size(self) -> int:
-        with self._lock:
-            return len(self._q)
+        """Snapshot of the queue length (read without the lock)."""
+        return len(self._q)
 
     # ---------- producers (visitors) ----------
     def enqueue(self, obj, now_minute: int) -> bool:
         """
         Add a visitor to the tail of the queue.
         Returns False if the queue is at max capacity.
+        A visitor already in line keeps their place and True is returned.
         """
-        item = QueueItem(obj=obj, enq_minute=now_minute, priority=False)
+        key = id(obj)
         with self._lock:
+            if key in self._q:
+                return True
             if self._max_size is not None and len(self._q) >= self._max_size:
                 return False
-            self._q.append(item)
+            self._q[key] = QueueItem.acquire(obj, now_minute, False)
             self._not_empty.notify()   # wake any waiting staff thread
             return True
 
     def remove(self, obj) -> bool:
         """
-        Remove the first occurrence of `obj` (visitor) from the queue.
+        Remove `obj` (visitor) from the queue.
         Returns True if removed (e.g., impatience/abandon).
         """
         with self._lock:
-            for i, it in enumerate(self._q):
-                if it.obj is obj:                  # identity match
-                    self._rotate_remove(i)
-                    return True
+            item = self._q.pop(id(obj), None)   # identity match
+        if item is None:
             return False
-
-    def _rotate_remove(self, index: int) -> None:
-        self._q.rotate(-index)
-        self._q.popleft()
-        self._q.rotate(index)
+        item.release()
+        return True
 
     # ---------- consumers (staff) ----------
+    def get_batch(self, n: int) -> List[QueueItem]:
+        """
+        Non-blocking: pop up to n customers (FIFO) under a single lock acquisition.
+        The caller should release() each item once read.
+        """
+        with self._lock:
+            return _drain(self._q, n)
+
     def get_next(self, block: bool, clock, timeout_minutes: Optional[int] = None) -> Optional[QueueItem]:
         """
-        Pop the next customer (FIFO).
+        Pop the next customer (FIFO). The caller should release() the item once read.
         - block=False: non-blocking; return None if empty.
         - block=True: wait until someone arrives or until timeout (in simulated minutes).
         """
@@ -245,7 +298,7 @@ class ServiceQueue:
             # non-blocking path
             if not block:
                 if self._q:
-                    return self._q.popleft()
+                    return self._q.popitem(last=False)[1]
                 return None
 
             # blocking path
@@ -255,11 +308,13 @@ class ServiceQueue:
                     while not self._q:
                         self._not_empty.wait(timeout=clock.seconds_per_minute())
                 else:
-                    remaining = timeout_minutes
-                    while remaining > 0 and not self._q:
-                        self._not_empty.wait(timeout=clock.seconds_per_minute())
-                        remaining -= 1
+                    deadline = time.monotonic() + timeout_minutes * clock.seconds_per_minute()
+                    while not self._q:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._not_empty.wait(timeout=remaining)
 
             if self._q:
-                return self._q.popleft()
+                return self._q.popitem(last=False)[1]
             return None
\ No newline at end of file
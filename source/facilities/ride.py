@@ -1,18 +1,17 @@
 # source/facilities/ride.py
 import threading
-import time
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+from array import array
 from typing import List
 from core import Clock
-from facilities.queues import RideQueue
-from facilities.ride_states import OpenState, BoardingState, BrokenState, MaintenanceState, RideState
+from .queues import RideQueue
+from .ride_states import OpenState, BoardingState, BrokenState, MaintenanceState, RideState
+
+class Ride:
+    QUEUE_REPORT_INTERVAL = 5  # Sample queue length every 5 minutes
+    QUEUE_FLUSH_INTERVAL = 60  # Hand the samples to metrics once per sim hour
 
-class Ride(threading.Thread):
     def __init__(self, name: str, capacity: int, run_duration: int, board_window: int,
                  queue: RideQueue, clock: Clock, metrics=None, popularity: float = 0.5):
-        super().__init__(daemon=True)
         self.name = name
         self.capacity = capacity
         self.run_duration = run_duration          # sim minutes the cycle takes
@@ -22,7 +21,15 @@ class Ride(threading.Thread):
         self.metrics = metrics
         self.popularity = popularity
         self._broken_until = 0
-        self._repair_thread = None
+        self._repair_scheduled = False
+        self.scheduler = None        # set by Scheduler.add()
+        self._last_queue_report = 0
+        self._last_queue_flush = 0
+        self._q_sample_times = array('i')  # queue-length samples since the last flush
+        self._q_samples = array('i')
+        self._last_q_len = None            # last sampled length; unchanged samples are skipped
+        self._pending_batch = None   # riders of the cycle in progress
+        self._cycle_finish_at = 0
 
 
         # Instantiate states
@@ -39,14 +46,12 @@ class Ride(threading.Thread):
     # ---- Context <-> State plumbing ----
     def _bind(self, state: RideState):
         state.ride = self
-        # allow states to run enter hook
-        try: state.on_enter()
-        except AttributeError: pass
+        # run the enter hook (RideState provides a no-op default)
+        state.on_enter()
 
     def transition_to(self, state: RideState):
-        # exit old state
-        try: self._state.on_exit()
-        except Exception: pass
+        # exit old state (RideState provides a no-op on_exit, so no guard needed)
+        self._state.on_exit()
         # enter new state
         self._state = state
         self._bind(state)
@@ -60,55 +65,96 @@ class Ride(threading.Thread):
     def can_enqueue(self) -> bool:
         return self._state.can_enqueue()
 
-    # ---- Ride thread loop ----
-    def run(self):
-        last_queue_report = 0
-        queue_report_interval = 5  # Report queue length every 5 minutes
-        
-        while not self.clock.should_stop():
-            # Periodically report queue length for wait time tracking
-            current_minute = self.clock.now()
-            if current_minute - last_queue_report >= queue_report_interval:
-                queue_length = self.queue.size()
-                if self.metrics:
-                    try:
-                        self.metrics.record_queue_length(self.name, queue_length, current_minute)
-                    except Exception:
-                        pass
-                last_queue_report = current_minute
-            
-            # Let the state do one minute worth of work
-            self._state.tick()
-            # advance sim time by 1 minute
-            self.clock.sleep_minutes(1)
-        
-        # Final queue length report at shutdown
-        if self.metrics:
-            try:
-                self.metrics.record_queue_length(self.name, self.queue.size(), self.clock.now())
-            except Exception:
-                pass
+    # ---- Per-minute work (driven by the park's Scheduler) ----
+    def tick(self, now: int) -> int:
+        """One simulated minute of work; returns the minute to be ticked again."""
+        # While a cycle runs the only work left is finishing it at its end minute
+        if self._pending_batch is not None:
+            if now < self._cycle_finish_at:
+                return self._cycle_finish_at
+            self._finish_cycle(now)
+            return now + 1
+
+        # Periodically sample queue length for wait time tracking
+        if now - self._last_queue_report >= self.QUEUE_REPORT_INTERVAL:
+            self._sample_queue(now, self.queue.size())
+            self._last_queue_report = now
+            if now - self._last_queue_flush >= self.QUEUE_FLUSH_INTERVAL:
+                self.flush_queue_samples(now)
+
+        # Let the state do one minute worth of work
+        self._state.tick(now)
+        if self._pending_batch is not None:
+            # a cycle just started: nothing to do until it finishes
+            return self._cycle_finish_at
+        return self._state.next_due(now)
+
+    def shutdown(self, now: int):
+        # Final queue length sample at shutdown, kept even if unchanged so the series reaches closing
+        self._sample_queue(now, self.queue.size(), force=True)
+        self.flush_queue_samples(now)
+
+    def _sample_queue(self, now: int, length: int, force: bool = False):
+        # only changes are stored: readers hold each value until the next sample
+        if length == self._last_q_len and not force:
+            return
+        self._last_q_len = length
+        self._q_sample_times.append(now)
+        self._q_samples.append(length)
+
+    def flush_queue_samples(self, now: int):
+        """Write the buffered queue-length samples as one metrics row."""
+        if self.metrics and self._q_samples:
+            self.metrics.record_queue_series(self.name, self._q_sample_times, self._q_samples, now)
+        self._q_sample_times = array('i')
+        self._q_samples = array('i')
+        self._last_queue_flush = now
+
+    # ---- Idle parking ----
+    def park_until_riders(self, now: int) -> bool:
+        """
+        Drop out of the scheduler while the queue is empty; the next enqueue
+        re-schedules tick(). Returns False if the queue is not empty (or there
+        is no scheduler), in which case the ride keeps ticking.
+        """
+        if self.scheduler is None:
+            return False
+        if not self.queue.notify_when_nonempty(self._wake):
+            return False
+        # the queue sits at zero until the wake-up: close the wait-time series there
+        self._sample_queue(now, 0)
+        return True
+
+    def _wake(self):
+        self.scheduler.schedule_at(self.clock.now(), self.tick)
 
     # ---- Operations used by states ----
-    def _run_cycle(self, batch: List):
-        """Simulate one ride cycle for the boarded batch; notify visitors; record metrics."""
+    def _start_cycle(self, batch: List, now: int):
+        """Board the batch and record it; the ride finishes run_duration minutes later."""
         # record boarding
         if self.metrics:
-            try:
-                self.metrics.record_board(self.name, len(batch), self.clock.now(), ride_popularity=self.popularity)
-            except Exception:
-                pass
+            self.metrics.record_board(self.name, len(batch), now, ride_popularity=self.popularity)
 
-        # “Run” the ride
-        self.clock.sleep_minutes(self.run_duration)
+        # “Run” the ride: tick() finishes the cycle at this minute
+        self._pending_batch = batch
+        self._cycle_finish_at = now + self.run_duration
+
+    def _finish_cycle(self, now: int):
+        """Notify the riders of the finished cycle and reopen the ride."""
+        batch, self._pending_batch = self._pending_batch, None
 
         # signal riders that the cycle finished (you’ll have a per-visitor event in your Visitor)
+        name = self.name
         for item in batch:
             try:
                 # item.obj is your Visitor; call its “on_ride_done” or set an Event on it
-                item.obj.on_ride_finished(self.name, self.clock.now())
+                item.obj.on_ride_finished(name, now)
             except Exception:
                 pass
+            item.release()
+
+        # After a cycle, go back OPEN (unless something else forces a change)
+        self.transition_to(self.open)
 
     # ---- External triggers for maintenance/failures ----
     def is_broken(self) -> bool:
@@ -116,12 +162,7 @@ class Ride(threading.Thread):
         Returns True if the ride is currently not operational.
         We treat both BROKEN and MAINTENANCE as 'down'.
         """
-        try:
-            state_name = self._state.name()
-        except Exception:
-            # fallback if state not bound yet
-            state_name = str(getattr(self._state, "__class__", type(self._state)).__name__)
-        return state_name in ("BROKEN", "MAINTENANCE")
+        return self._state.IS_DOWN
 
     def break_for(self, repair_minutes):
         now = self.clock.now()
@@ -133,29 +174,21 @@ class Ride(threading.Thread):
                 print(f"[minute {now}] {self.name} BREAKS for {ext} minutes")
                 # Record breakdown event
                 if self.metrics:
-                    try:
-                        self.metrics.record_breakdown(self.name, now, ext)
-                    except Exception:
-                        pass
-                if self._repair_thread is None or not self._repair_thread.is_alive():
-                    self._repair_thread = threading.Thread(target=self._repair_guardian, daemon=True)
-                    self._repair_thread.start()
+                    self.metrics.record_breakdown(self.name, now, ext)
+                # without a scheduler nothing would run the repair callback
+                if self.scheduler is not None and not self._repair_scheduled:
+                    self._repair_scheduled = True
+                    self.scheduler.schedule_at(self._broken_until, self._on_repaired)
             # if already broken, we silently extend; no duplicate print
 
-    def _repair_guardian(self):
-        printed = False
-        while not self.clock.should_stop():
-            now = self.clock.now()
-            with self._lock:
-                if now >= self._broken_until:
-                    if not printed:
-                        print(f"[minute {now}] {self.name} REPAIRED")
-                        # Record repair event
-                        if self.metrics:
-                            try:
-                                self.metrics.record_repair(self.name, now)
-                            except Exception:
-                                pass
-                        printed = True
-                    break
-            time.sleep(0.01)
+    def _on_repaired(self, now: int):
+        """Scheduler callback at _broken_until; re-arms itself if the repair was extended."""
+        with self._lock:
+            if now < self._broken_until:
+                return self._broken_until
+            self._repair_scheduled = False
+        print(f"[minute {now}] {self.name} REPAIRED")
+        # Record repair event
+        if self.metrics:
+            self.metrics.record_repair(self.name, now)
+        return None
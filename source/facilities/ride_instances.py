@@ -1,47 +1,73 @@
+from typing import List, Tuple, Type
+
 from .ride import Ride
 
-class RollerCoaster(Ride):
-    """Fast, thrilling ride with high popularity."""
+
+class PresetRide(Ride):
+    """
+    A ride whose constants live in a class-level PARAMS tuple:
+    (name, capacity, run_duration, board_window, popularity).
+    Concrete rides only declare PARAMS; they are built as cls(queue, clock, metrics).
+    """
+    PARAMS: Tuple[str, int, int, int, float] = ()
+
     def __init__(self, queue, clock, metrics=None):
-        super().__init__("RollerCoaster", 16, 5, 3, queue, clock, metrics, 0.9)
+        name, capacity, run_duration, board_window, popularity = self.PARAMS
+        super().__init__(name, capacity, run_duration, board_window, queue, clock, metrics, popularity)
+
 
-class DropTower(Ride):
+# Every ride class built into the park, in definition order.
+RIDE_REGISTRY: List[Type[PresetRide]] = []
+
+
+def register_ride(cls: Type[PresetRide]) -> Type[PresetRide]:
+    """Class decorator: add a Ride subclass to RIDE_REGISTRY."""
+    RIDE_REGISTRY.append(cls)
+    return cls
+
+
+@register_ride
+class RollerCoaster(PresetRide):
+    """Fast, thrilling ride with high popularity."""
+    PARAMS = ("RollerCoaster", 16, 5, 3, 0.9)
+
+@register_ride
+class DropTower(PresetRide):
     """Intense vertical free-fall experience."""
-    def __init__(self, queue, clock, metrics=None):
-        super().__init__("DropTower", 8, 3, 2, queue, clock, metrics, 0.8)
+    PARAMS = ("DropTower", 8, 3, 2, 0.8)
 
-class FerrisWheel(Ride):
+@register_ride
+class FerrisWheel(PresetRide):
     """Calm panoramic ride for all ages."""
-    def __init__(self, queue, clock, metrics=None):
-        super().__init__("FerrisWheel", 20, 7, 4, queue, clock, metrics, 0.6)
+    PARAMS = ("FerrisWheel", 20, 7, 4, 0.6)
 
-class BumperCars(Ride):
+@register_ride
+class BumperCars(PresetRide):
     """Classic, great for groups."""
-    def __init__(self, queue, clock, metrics=None):
-        super().__init__("BumperCars", 12, 4, 2, queue, clock, metrics, 0.5)
+    PARAMS = ("BumperCars", 12, 4, 2, 0.5)
 
-class HauntedHouse(Ride):
+@register_ride
+class HauntedHouse(PresetRide):
     """Dark indoor maze filled with spooky effects."""
-    def __init__(self, queue, clock, metrics=None):
-        super().__init__("HauntedHouse", 10, 6, 3, queue, clock, metrics, 0.7)
+    PARAMS = ("HauntedHouse", 10, 6, 3, 0.7)
 
-class SplashMountain(Ride):
+@register_ride
+class SplashMountain(PresetRide):
     """Water based splash adventure ride."""
-    def __init__(self, queue, clock, metrics=None):
-        super().__init__("SplashMountain", 12, 5, 3, queue, clock, metrics, 0.8)
+    PARAMS = ("SplashMountain", 12, 5, 3, 0.8)
 
-class SpinningTeacups(Ride):
+@register_ride
+class SpinningTeacups(PresetRide):
     """kids/family favorite."""
-    def __init__(self, queue, clock, metrics=None):
-        super().__init__("SpinningTeacups", 18, 4, 3, queue, clock, metrics, 0.65)
+    PARAMS = ("SpinningTeacups", 18, 4, 3, 0.65)
 
-class PirateShip(Ride):
+@register_ride
+class PirateShip(PresetRide):
     """Pendulum swing ride"""
-    def __init__(self, queue, clock, metrics=None):
-        super().__init__("PirateShip", 14, 5, 2, queue, clock, metrics, 0.7)
+    PARAMS = ("PirateShip", 14, 5, 2, 0.7)
 
 
-class SpaceSimulator(Ride):
+@register_ride
+class SpaceSimulator(PresetRide):
     """High-tech spinning capsule simulating space flight."""
-    def __init__(self, queue, clock, metrics=None):
-        super().__init__("SpaceSimulator", 10, 6, 3, queue, clock, metrics, 0.85)
+    PARAMS = ("SpaceSimulator", 10, 6, 3, 0.85)
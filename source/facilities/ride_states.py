@@ -11,10 +11,17 @@ class RideState(ABC):
     # The Ride context will set this when we transition_into(...)
     ride: "Ride" = None  # type: ignore
 
+    # True for states where the ride is not operational (Ride.is_broken)
+    IS_DOWN = False
+
     # optional hooks
     def on_enter(self): ...
     def on_exit(self): ...
 
+    def next_due(self, now: int) -> int:
+        """Minute at which the ride needs its next tick (default: every minute)."""
+        return now + 1
+
     @abstractmethod
     def name(self) -> str: ...
 
@@ -24,9 +31,9 @@ class RideState(ABC):
         ...
 
     @abstractmethod
-    def tick(self):
+    def tick(self, now: int):
         """
-        Called by the Ride thread once per simulated minute.
+        Called by the Ride once per simulated minute with the current minute.
         This is where the state performs its work and may transition.
         """
         ...
@@ -36,12 +43,18 @@ class OpenState(RideState):
     def name(self) -> str: return "OPEN"
     def can_enqueue(self) -> bool: return True
 
-    def tick(self):
+    def tick(self, now: int):
         # If there are people, consider starting a boarding window
         if self.ride.queue.size() > 0:
             # Move to Boarding to collect a batch
             self.ride.transition_to(self.ride.boarding)
 
+    def next_due(self, now: int):
+        # Nobody waiting: sleep until the queue wakes us instead of polling
+        if self.ride.park_until_riders(now):
+            return None
+        return now + 1
+
 
 class BoardingState(RideState):
     def name(self) -> str: return "BOARDING"
@@ -51,17 +64,16 @@ class BoardingState(RideState):
         # (optional) you could mark the beginning of a boarding window
         self._minutes_in_window = 0
 
-    def tick(self):
+    def tick(self, now: int):
         # Give the queue a short window to fill seats
         self._minutes_in_window += 1
         # Pull a batch (fairness rule handled by the queue)
         batch = self.ride.queue.get_batch_for_boarding(self.ride.capacity)
 
         if batch:
-            # Run the ride cycle (this sleeps run_duration sim minutes and notifies visitors)
-            self.ride._run_cycle(batch)
-            # After a cycle, go back OPEN (unless something else forces a change)
-            self.ride.transition_to(self.ride.open)
+            # Start the ride cycle; the ride finishes it (notifies visitors and
+            # goes back OPEN) run_duration sim minutes later
+            self.ride._start_cycle(batch, now)
         else:
             # No one to board; if window exceeds board_window, go back OPEN
             if self._minutes_in_window >= self.ride.board_window:
@@ -72,8 +84,11 @@ class BoardingState(RideState):
 
 
 class BrokenState(RideState):
+    IS_DOWN = True
+
     def __init__(self, repair_minutes: int = 0):
         self._remaining = max(0, repair_minutes)
+        self._reopen_at = 0
 
     def name(self) -> str: return "BROKEN"
     def can_enqueue(self) -> bool: return False
@@ -82,23 +97,35 @@ class BrokenState(RideState):
         # if none provided externally, default to a small fix time
         if self._remaining == 0:
             self._remaining = 15
+        # absolute minute instead of a per-tick countdown
+        self._reopen_at = self.ride.clock.now() + self._remaining
 
-    def tick(self):
-        # Count down; when repaired, reopen
-        if self._remaining > 0:
-            self._remaining -= 1
-        if self._remaining <= 0:
+    def next_due(self, now: int) -> int:
+        # nothing to do until the repair is done
+        return max(now + 1, self._reopen_at)
+
+    def tick(self, now: int):
+        # When repaired, reopen
+        if now >= self._reopen_at:
             self.ride.transition_to(self.ride.open)
 
 
 class MaintenanceState(RideState):
+    IS_DOWN = True
+
     def __init__(self, minutes: int):
         self._remaining = max(1, minutes)
+        self._reopen_at = 0
 
     def name(self) -> str: return "MAINTENANCE"
     def can_enqueue(self) -> bool: return False
 
-    def tick(self):
-        self._remaining -= 1
-        if self._remaining <= 0:
+    def on_enter(self):
+        self._reopen_at = self.ride.clock.now() + self._remaining
+
+    def next_due(self, now: int) -> int:
+        return max(now + 1, self._reopen_at)
+
+    def tick(self, now: int):
+        if now >= self._reopen_at:
             self.ride.transition_to(self.ride.open)
@@ -0,0 +1,53 @@
+# source/fastmath.py
+"""
+Numeric kernels for the arrival curve and weighted sampling.
+Compiled with Numba when it is installed (and cached on disk between runs);
+otherwise the same functions run as plain Python/NumPy.
+Import this module lazily: importing Numba itself is slow.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        # no-op stand-in for numba.njit, with or without arguments
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda f: f
+
+
+@njit(cache=True)
+def curve_weights(xs, ys, n):
+    """
+    Evaluate the piecewise-linear curve through (xs, ys) at minutes 0..n-1.
+    Clamped to the end values outside [xs[0], xs[-1]] and to zero from below.
+    xs must be sorted ascending.
+    """
+    out = np.empty(n, dtype=np.float64)
+    last = len(xs) - 1
+    j = 0
+    for m in range(n):
+        if m <= xs[0]:
+            y = ys[0]
+        elif m >= xs[last]:
+            y = ys[last]
+        else:
+            # segments are visited in order, so j only ever moves forward
+            while xs[j + 1] < m:
+                j += 1
+            span = xs[j + 1] - xs[j]
+            t = 0.0 if span == 0 else (m - xs[j]) / span
+            y = ys[j] + t * (ys[j + 1] - ys[j])
+        out[m] = y if y > 0.0 else 0.0
+    return out
+
+
+@njit(cache=True)
+def sample_indices(cum, u):
+    """Map uniform draws u in [0, 1) to indices drawn with cumulative weights cum."""
+    idx = np.searchsorted(cum, u * cum[-1], side="right")
+    return np.minimum(idx, len(cum) - 1)
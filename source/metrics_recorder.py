@@ -1,21 +1,39 @@
 import csv
+import importlib.util
 import os
+import queue
 import threading
-try:
-    import matplotlib
-    matplotlib.use('Agg')  # Non-interactive backend
-    import matplotlib.pyplot as plt
-    from collections import defaultdict
-    HAS_MATPLOTLIB = True
-except ImportError:
-    HAS_MATPLOTLIB = False
+import time
+from collections import defaultdict
+# matplotlib and pandas are optional and slow to import: they are loaded
+# only when the wait time graph is generated
 
 class MetricsRecorder:
     """
     Thread-safe CSV logger for simulation events.
     Call record_* methods from any thread (arrival, ride, visitor, staff).
+
+    Producers only put rows on an unbounded queue; a single writer thread
+    drains it, writes up to BATCH_SIZE rows at a time and flushes the file
+    at most every FLUSH_INTERVAL seconds. close() writes everything left.
     """
 
+    BATCH_SIZE = 512
+    FLUSH_INTERVAL = 0.2  # seconds
+
+    # CSV columns; rows are plain tuples in this order
+    FIELDS = (
+        "sim_time",
+        "event",
+        # common fields
+        "visitor_id",
+        "visitor_type",
+        "ride_name",
+        "count",
+        "ride_popularity",
+        "reason",
+    )
+
     def __init__(self, out_dir: str = "results", filename: str = "metrics.csv"):
         self.out_dir = out_dir
         self.filename = filename
@@ -23,155 +41,221 @@ class MetricsRecorder:
         os.makedirs(out_dir, exist_ok=True)
 
         # Create file with header if new/empty
-        self._lock = threading.Lock()
         new_file = not os.path.exists(self._path) or os.path.getsize(self._path) == 0
-        self._fh = open(self._path, "a", newline="", encoding="utf-8")
-        self._writer = csv.DictWriter(self._fh, fieldnames=[
-            "sim_time",
-            "event",
-            # common fields
-            "visitor_id",
-            "visitor_type",
-            "ride_name",
-            "count",
-            "ride_popularity",
-            "reason",
-        ])
+        # large buffer: the writer thread decides when to flush
+        self._fh = open(self._path, "a", newline="", encoding="utf-8", buffering=1 << 20)
+        self._writer = csv.writer(self._fh)
         if new_file:
-            self._writer.writeheader()
+            self._writer.writerow(self.FIELDS)
             self._fh.flush()
 
+        # sim_time strings for a whole day, formatted once
+        self._sim_time_table = [self._format_sim_time(m) for m in range(24 * 60)]
+
+        # chunks of rows from producers; None tells the writer to stop
+        self._queue = queue.SimpleQueue()
+        self._writer_thread = threading.Thread(target=self._drain_loop, name="metrics-writer", daemon=True)
+        self._writer_thread.start()
+
     # ---------- low-level write ----------
-    def _write(self, row: dict, sim_minute: int = None):
-        if sim_minute is not None:
-            # Convert sim_minute to time format (minute 0 = 10:00 AM)
-            hours = 10 + (sim_minute // 60)
-            minutes = sim_minute % 60
-            # Handle PM times
-            if hours >= 12:
-                if hours > 12:
-                    row["sim_time"] = f"{hours:02d}:{minutes:02d} PM"
-                else:
-                    row["sim_time"] = f"{hours:02d}:{minutes:02d} PM"
-            else:
-                row["sim_time"] = f"{hours:02d}:{minutes:02d} AM"
-        with self._lock:
-            self._writer.writerow(row)
-            self._fh.flush()
+    @staticmethod
+    def _format_sim_time(sim_minute: int) -> str:
+        # minute 0 = 10:00 AM, 12-hour clock
+        hours, minutes = divmod((10 * 60 + sim_minute) % (24 * 60), 60)
+        suffix = "AM" if hours < 12 else "PM"
+        return f"{hours % 12 or 12:02d}:{minutes:02d} {suffix}"
+
+    def _sim_time(self, sim_minute: int = None) -> str:
+        if sim_minute is None:
+            return ""
+        if 0 <= sim_minute < len(self._sim_time_table):
+            return self._sim_time_table[sim_minute]
+        return self._format_sim_time(sim_minute)
+
+    def _write(self, row: tuple):
+        """Queue one row, a tuple laid out like FIELDS."""
+        self._queue.put([row])
+
+    def _drain_loop(self):
+        """Writer thread: batch rows from the queue into the CSV file."""
+        last_flush = time.monotonic()
+        stopping = False
+        while not stopping:
+            try:
+                chunk = self._queue.get(timeout=self.FLUSH_INTERVAL)
+            except queue.Empty:
+                chunk = []
+            batch = []
+            while True:
+                if chunk is None:
+                    stopping = True
+                    break
+                batch.extend(chunk)
+                if len(batch) >= self.BATCH_SIZE:
+                    break
+                try:
+                    chunk = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self._writer.writerows(batch)
+            now = time.monotonic()
+            if stopping or now - last_flush >= self.FLUSH_INTERVAL:
+                self._fh.flush()
+                last_flush = now
+
+    def record_batch(self, events):
+        """
+        Record many visitor/place events as a single chunk for the writer thread.
+        events: iterable of (event, visitor_id, place_name, sim_minute) tuples,
+        e.g. ("order", 12, "BurgerTruck", 95). The place goes in the ride_name column.
+        """
+        sim_time = self._sim_time
+        rows = [
+            (sim_time(sim_minute), event, visitor_id, None, place, None, None, None)
+            for event, visitor_id, place, sim_minute in events
+        ]
+        if rows:
+            self._queue.put(rows)
+
+    # Rows below are (sim_time, event, visitor_id, visitor_type, ride_name, count, ride_popularity, reason)
 
     # ---------- arrivals ----------
     def record_arrival(self, visitor_id: int, visitor_type: str, sim_minute: int):
-        self._write({
-            "event": "arrival",
-            "visitor_id": visitor_id,
-            "visitor_type": visitor_type,
-        }, sim_minute)
+        self._write((self._sim_time(sim_minute), "arrival", visitor_id, visitor_type, None, None, None, None))
 
     # ---------- ride-related ----------
     def record_board(self, ride_name: str, count: int, sim_minute: int, ride_popularity=None):
-        self._write({
-            "event": "ride_board",
-            "ride_name": ride_name,
-            "count": count,
-            "ride_popularity": ride_popularity,
-        }, sim_minute)
+        self._write((self._sim_time(sim_minute), "ride_board", None, None, ride_name, count, ride_popularity, None))
 
     def record_abandon(self, visitor_id: int, ride_name: str, waited_minutes: int, sim_minute: int):
-        self._write({
-            "event": "queue_abandon",
-            "visitor_id": visitor_id,
-            "ride_name": ride_name,
-            "reason": f"waited={waited_minutes}",
-        }, sim_minute)
+        self._write((self._sim_time(sim_minute), "queue_abandon", visitor_id, None, ride_name, None, None,
+                     f"waited={waited_minutes}"))
 
     def record_exit(self, visitor_id: int, sim_minute: int, reason: str = "done"):
-        self._write({
-            "event": "exit",
-            "visitor_id": visitor_id,
-            "reason": reason,
-        }, sim_minute)
+        self._write((self._sim_time(sim_minute), "exit", visitor_id, None, None, None, None, reason))
 
     # ---------- ride maintenance ----------
     def record_breakdown(self, ride_name: str, sim_minute: int, repair_duration: int):
-        self._write({
-            "event": "ride_breakdown",
-            "ride_name": ride_name,
-            "count": repair_duration,  # duration in minutes
-        }, sim_minute)
+        # count column holds the repair duration in minutes
+        self._write((self._sim_time(sim_minute), "ride_breakdown", None, None, ride_name, repair_duration, None, None))
 
     def record_repair(self, ride_name: str, sim_minute: int):
-        self._write({
-            "event": "ride_repaired",
-            "ride_name": ride_name,
-        }, sim_minute)
+        self._write((self._sim_time(sim_minute), "ride_repaired", None, None, ride_name, None, None, None))
 
     # ---------- food/service ----------
     def record_order(self, visitor_id: int, stall_name: str, sim_minute: int):
-        self._write({
-            "event": "order",
-            "visitor_id": visitor_id,
-            "ride_name": stall_name,  # reuse column for place name
-        }, sim_minute)
+        # reuse ride_name column for place name
+        self._write((self._sim_time(sim_minute), "order", visitor_id, None, stall_name, None, None, None))
 
     def record_served(self, visitor_id: int, stall_name: str, sim_minute: int):
-        self._write({
-            "event": "served",
-            "visitor_id": visitor_id,
-            "ride_name": stall_name,
-        }, sim_minute)
+        self._write((self._sim_time(sim_minute), "served", visitor_id, None, stall_name, None, None, None))
 
     # ---------- queue tracking ----------
-    def record_queue_length(self, ride_name: str, queue_length: int, sim_minute: int):
-        """Record current queue length for wait time analysis."""
-        self._write({
-            "event": "queue_length",
-            "ride_name": ride_name,
-            "count": queue_length,
-        }, sim_minute)
+    def record_queue_series(self, ride_name: str, minutes, lengths, sim_minute: int):
+        """
+        Record many queue-length samples as a single row.
+        count holds the number of samples, reason the packed "minute:length" pairs.
+        """
+        packed = ";".join(f"{m}:{n}" for m, n in zip(minutes, lengths))
+        self._write((self._sim_time(sim_minute), "queue_length_series", None, None, ride_name, len(lengths), None,
+                     packed))
 
     # ---------- cleanup ----------
     def close(self):
-        with self._lock:
-            try:
-                self._fh.flush()
-            finally:
-                self._fh.close()
+        """Write out every queued row, stop the writer thread and close the file."""
+        self._queue.put(None)
+        self._writer_thread.join()
+        try:
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+        finally:
+            self._fh.close()
 
     # ---------- visualization ----------
+    def _read_queue_data_csv(self):
+        """Queue-length samples as {ride_name: {minute: length}}, parsed row by row."""
+        queue_data = defaultdict(lambda: defaultdict(int))
+        with open(self._path, 'r') as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                if row['event'] == 'queue_length_series':
+                    # packed "minute:length;minute:length" samples
+                    ride_name = row.get('ride_name', '')
+                    for pair in filter(None, row.get('reason', '').split(';')):
+                        minute, count = pair.split(':')
+                        queue_data[ride_name][int(minute)] = int(count)
+                elif row['event'] == 'queue_length':
+                    # legacy one-row-per-sample files written before queue_length_series
+                    ride_name = row.get('ride_name', '')
+                    sim_time = row.get('sim_time', '')
+                    count = int(row.get('count', 0))
+                        
+                    if ride_name and sim_time:
+                        # Convert HH:MM AM/PM to minutes since opening (10 AM = minute 0)
+                        # Remove AM/PM suffix and parse time
+                        time_str = sim_time.replace(' AM', '').replace(' PM', '')
+                        time_parts = time_str.split(':')
+                        hour = int(time_parts[0])
+                        minute = int(time_parts[1])
+                            
+                        # Convert to minutes since 10 AM opening
+                        # (older files wrote afternoons as "13:00 PM")
+                        if 'PM' in sim_time and hour < 12:
+                            hour += 12
+                        elif 'AM' in sim_time and hour == 12:
+                            hour = 0
+                            
+                        total_minutes = (hour - 10) * 60 + minute
+                        queue_data[ride_name][total_minutes] = count
+        return queue_data
+
+    def _read_queue_data_pandas(self):
+        """Same as _read_queue_data_csv, with vectorized parsing."""
+        import pandas as pd
+        df = pd.read_csv(self._path, usecols=['sim_time', 'event', 'ride_name', 'count', 'reason'],
+                         dtype={'reason': str})
+
+        # packed "minute:length;minute:length" samples, one per row after explode
+        series = df.loc[df.event == 'queue_length_series', ['ride_name', 'reason']].dropna()
+        pairs = series.assign(pair=series.reason.str.split(';')).explode('pair').reset_index(drop=True)
+        parsed = pairs.pair.str.extract(r'^(\d+):(\d+)$').astype(float)
+        samples = [pd.DataFrame({'ride_name': pairs.ride_name,
+                                 'minute': parsed[0],
+                                 'count': parsed[1]}).dropna()]
+
+        # legacy one-row-per-sample rows: "HH:MM AM/PM" since the 10 AM opening
+        legacy = df[(df.event == 'queue_length') & df.ride_name.notna()]
+        hm = legacy.sim_time.str.extract(r'^(\d+):(\d+) ([AP]M)$')
+        hour = hm[0].astype(float)
+        pm = hm[2] == 'PM'
+        hour = hour.mask(pm & (hour < 12), hour + 12).mask(~pm & (hour == 12), 0)
+        samples.append(pd.DataFrame({'ride_name': legacy.ride_name,
+                                     'minute': (hour - 10) * 60 + hm[1].astype(float),
+                                     'count': legacy['count']}).dropna())
+
+        queue_data = defaultdict(lambda: defaultdict(int))
+        for ride_name, grp in pd.concat(samples).groupby('ride_name', sort=False):
+            queue_data[ride_name].update(zip(grp.minute.astype(int), grp['count'].astype(int)))
+        return queue_data
+
     def generate_wait_time_graph(self, include_rides: list = None):
         """Generate attraction wait time graph from metrics."""
-        if not HAS_MATPLOTLIB:
+        try:
+            import matplotlib
+            matplotlib.use('Agg')  # Non-interactive backend
+            import matplotlib.pyplot as plt
+        except ImportError:
             print("⚠️  matplotlib not available, skipping graph generation")
             return
 
         # Read queue length data from CSV
-        queue_data = defaultdict(lambda: defaultdict(int))
-        
+        if importlib.util.find_spec("pandas") is not None:
+            read_queue_data = self._read_queue_data_pandas
+        else:
+            read_queue_data = self._read_queue_data_csv
         try:
-            with open(self._path, 'r') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    if row['event'] == 'queue_length':
-                        ride_name = row.get('ride_name', '')
-                        sim_time = row.get('sim_time', '')
-                        count = int(row.get('count', 0))
-                        
-                        if ride_name and sim_time:
-                            # Convert HH:MM AM/PM to minutes since opening (10 AM = minute 0)
-                            # Remove AM/PM suffix and parse time
-                            time_str = sim_time.replace(' AM', '').replace(' PM', '')
-                            time_parts = time_str.split(':')
-                            hour = int(time_parts[0])
-                            minute = int(time_parts[1])
-                            
-                            # Convert to minutes since 10 AM opening
-                            if 'PM' in sim_time and hour != 12:
-                                hour += 12
-                            elif 'AM' in sim_time and hour == 12:
-                                hour = 0
-                            
-                            total_minutes = (hour - 10) * 60 + minute
-                            queue_data[ride_name][total_minutes] = count
+            queue_data = read_queue_data()
         except Exception as e:
             print(f"⚠️  Error reading metrics for graph: {e}")
             return
@@ -194,7 +278,8 @@ class MetricsRecorder:
             if time_series:
                 times = sorted(time_series.keys())
                 wait_times = [time_series[t] for t in times]
-                plt.plot(times, wait_times, label=ride_name, linewidth=1.5, alpha=0.8)
+                # samples are only written when the length changes: hold each value
+                plt.step(times, wait_times, where='post', label=ride_name, linewidth=1.5, alpha=0.8)
         
         plt.xlabel('Time (minutes since opening)', fontsize=12)
         plt.ylabel('Queue Length (visitors)', fontsize=12)
@@ -1,6 +1,12 @@
 import threading, random
 
 class MaintenanceDaemon(threading.Thread):
+    """
+    Wears rides down minute by minute and breaks them for a random repair time.
+
+    In the park it runs as a scheduler task (tick/shutdown); main never starts
+    it as a thread. run() is only kept for standalone use in test/maintenance_test.
+    """
     def __init__(self, rides, clock, mean_uptime=120, mean_repair=15, daemon=True):
         super().__init__(daemon=daemon)
         self.rides = list(rides)
@@ -19,21 +25,34 @@ class MaintenanceDaemon(threading.Thread):
         status = getattr(ride, "status", lambda: "open")()
         return isinstance(status, str) and "broken" in status.lower()
 
+    # ---- scheduler task ----
+    def tick(self, now):
+        self._check_rides()
+        return now + 1
+
+    def shutdown(self, now):
+        pass
+
+    # ---- standalone thread loop (test/maintenance_test only) ----
     def run(self):
         while not self.clock.should_stop():
-            for ride in self.rides:
-                # --- new guard: do nothing while the ride is down ---
-                is_broken = getattr(ride, "is_broken", None)
-                if callable(is_broken) and is_broken():
-                    continue
-
-                name = ride.name
-                self._uptime_left[name] -= 1
-                if self._uptime_left[name] <= 0:
-                    repair_minutes = self._sample_repair()
-                    try:
-                        ride.break_for(repair_minutes)
-                    except Exception:
-                        pass
-                    self._uptime_left[name] = self._sample_uptime()
+            self._check_rides()
             self.clock.sleep_minutes(1)
+
+    def _check_rides(self):
+        """One simulated minute of wear on every ride that is up."""
+        for ride in self.rides:
+            # --- new guard: do nothing while the ride is down ---
+            is_broken = getattr(ride, "is_broken", None)
+            if callable(is_broken) and is_broken():
+                continue
+
+            name = ride.name
+            self._uptime_left[name] -= 1
+            if self._uptime_left[name] <= 0:
+                repair_minutes = self._sample_repair()
+                try:
+                    ride.break_for(repair_minutes)
+                except Exception:
+                    pass
+                self._uptime_left[name] = self._sample_uptime()
@@ -1,13 +1,12 @@
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
-from park.visitor_factory import ChildCreator, TouristCreator, AdrenalineAddictCreator
+from .visitor_factory import ChildCreator, TouristCreator, AdrenalineAddictCreator
 
 class Park:
     def __init__(self, clock, metrics):
         self.clock = clock
         self.metrics = metrics
         self.visitors = []
+        self.rides = []
+        self._rides_by_name = {}
         self._creators = {
             "Child": ChildCreator(),
             "Tourist": TouristCreator(),
@@ -26,14 +25,23 @@ class Park:
         self.visitors.append(visitor)
         return visitor
     
+    def add_ride(self, ride):
+        """Register a ride with the park (keeps the by-name index in sync)."""
+        self.rides.append(ride)
+        self._rides_by_name[ride.name] = ride
+
     def open_rides(self):
         # return Ride objects whose state allows enqueue
         return [r for r in self.rides if r.can_enqueue()]
 
     def estimated_wait_minutes(self, ride_name: str) -> int:
-        # quick heuristic: queue_length / (capacity per cycle) * run_duration
-        r = next((x for x in self.rides if x.name == ride_name), None)
+        r = self._rides_by_name.get(ride_name)
         if not r: return 0
+        return self.estimated_wait(r)
+
+    @staticmethod
+    def estimated_wait(r) -> int:
+        # quick heuristic: queue_length / (capacity per cycle) * run_duration
         q_len = r.queue.size()
         cap   = max(1, r.capacity)
         cycles = (q_len + cap - 1) // cap
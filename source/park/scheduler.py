@@ -0,0 +1,94 @@
+# source/park/scheduler.py
+import heapq
+import itertools
+import threading
+import traceback
+
+
+class Scheduler(threading.Thread):
+    """
+    Single event loop driving rides, food facilities, visitors, arrivals
+    and maintenance.
+
+    Callbacks are kept in a min-heap of (due_minute, seq, callback). Once per
+    simulated minute every callback that is due is dispatched with the current
+    minute; if it returns an int, it is re-inserted to fire at that minute
+    (e.g. now + 1 for "tick me again next minute"), if it returns None it is
+    dropped. A callback that raises is reported with its traceback and
+    dropped as well.
+
+    The scheduler is the clock's follower: it holds the clock from
+    construction (so it must be started), then releases it up to the next
+    due minute and sleeps until then, so minutes where nothing is due wake
+    nothing and run_until_close never moves past a minute before every
+    callback due in it has been dispatched; this holds in virtual mode too,
+    where the clock does not wait for the wall clock at all. schedule_at from
+    another thread holds the clock at that minute and wakes the loop, so the
+    callback still runs on time.
+
+    - add(task): task exposes tick(now) -> next due minute, and
+      shutdown(now), called once after the clock stops; the task gets
+      task.scheduler so it can schedule its own one-off callbacks
+    - schedule_at(minute, callback): one-off or self-rescheduling callback
+
+    Callbacks run one after another on the scheduler thread, so they must not
+    block: a ride cycle is a continuation scheduled at its finish minute
+    rather than a sleep.
+    """
+    def __init__(self, clock, daemon=True):
+        super().__init__(daemon=daemon)
+        self.clock = clock
+        self._heap = []
+        self._seq = itertools.count()  # tie-breaker: same-minute callbacks run in insertion order
+        self._lock = threading.Lock()
+        self._finalizers = []
+        clock.release_until(clock.now())  # hold the clock until minute 0 is dispatched
+
+    # ---- registration ----
+    def schedule_at(self, minute: int, callback):
+        with self._lock:
+            heapq.heappush(self._heap, (minute, next(self._seq), callback))
+            self.clock.hold_at(minute)
+
+    def add(self, task):
+        task.scheduler = self
+        self.schedule_at(self.clock.now(), task.tick)
+        self._finalizers.append(task.shutdown)
+
+    # ---- event loop ----
+    def _pop_due(self, now: int):
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                due.append(heapq.heappop(self._heap)[2])
+        return due
+
+    def _release_next(self, now: int):
+        # under the lock, so a callback pushed from another thread after
+        # _pop_due either lowers the release itself or is seen here
+        with self._lock:
+            self.clock.release_until(self._heap[0][0] if self._heap else float("inf"))
+
+    def _dispatch(self, callback, now: int):
+        try:
+            nxt = callback(now)
+        except Exception:
+            # a failing task would most likely fail the same way every minute:
+            # show the traceback once and drop it
+            print(f"⚠️ Scheduled callback {callback!r} failed at minute {now}; dropping it")
+            traceback.print_exc()
+            return
+        if nxt is not None:
+            self.schedule_at(nxt, callback)
+
+    def run(self):
+        while not self.clock.should_stop():
+            now = self.clock.now()
+            for callback in self._pop_due(now):
+                self._dispatch(callback, now)
+            self._release_next(now)
+            self.clock.wait_released()
+
+        now = self.clock.now()
+        for shutdown in list(self._finalizers):
+            shutdown(now)
@@ -3,10 +3,12 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 import random
 from typing import Optional, List
+from core import make_picker
 
 # We’ll call into these helpers; implement them in Park if you haven't yet.
 # - park.open_rides() -> List[Ride]
 # - park.estimated_wait_minutes(ride_name: str) -> int
+# - park.estimated_wait(ride) -> int  (same, for a Ride already in hand)
 # - visitor.ride_prefs: dict[str, float]  (preference weights per ride)
 
 class RideChoiceStrategy(ABC):
@@ -23,26 +25,23 @@ class RandomStrategy(RideChoiceStrategy):
 
 # 2) Preference-weighted (uses visitor.ride_prefs as weights)
 class PreferenceStrategy(RideChoiceStrategy):
+    def __init__(self):
+        # cumulative weights are rebuilt only when the set of open rides changes
+        self._cache_key = None
+        self._pick = None
+
     def pick_ride(self, visitor, park):
         rides = park.open_rides()
-        if not rides:
-            return None
-        items, weights = [], []
-        for r in rides:
-            w = visitor.ride_prefs.get(r.name, 1.0)
-            if w > 0:
-                items.append(r); weights.append(w)
-        if not items:
-            return None
-        # lightweight weighted pick
-        total = sum(weights)
-        x = random.random() * total
-        acc = 0.0
-        for item, w in zip(items, weights):
-            acc += w
-            if x <= acc:
-                return item
-        return items[-1]
+        key = (visitor, tuple(rides))
+        if key != self._cache_key:
+            items, weights = [], []
+            for r in rides:
+                w = visitor.ride_prefs.get(r.name, 1.0)
+                if w > 0:
+                    items.append(r); weights.append(w)
+            self._cache_key = key
+            self._pick = make_picker(items, weights) if items else None
+        return self._pick() if self._pick else None
 
 # 3) Tradeoff: preference * popularity, penalize long waits
 class PopularityWaitTradeoff(RideChoiceStrategy):
@@ -51,13 +50,14 @@ class PopularityWaitTradeoff(RideChoiceStrategy):
 
     def pick_ride(self, visitor, park):
         rides = park.open_rides()
+        prefs, estimate, threshold = visitor.ride_prefs, park.estimated_wait, self.wait_penalty_after
         best, best_score = None, -1e9
         for r in rides:
-            pref = visitor.ride_prefs.get(r.name, 1.0)
-            pop  = getattr(r, "popularity", 1.0)
-            eta  = max(0, park.estimated_wait_minutes(r.name) or 0)
+            pref = prefs.get(r.name, 1.0)
+            pop  = r.popularity
+            eta  = estimate(r)  # we hold the Ride already: no lookup by name
             # penalize waits longer than threshold
-            penalty = 1.0 / (1.0 + max(0, eta - self.wait_penalty_after))
+            penalty = 1.0 / (1.0 + max(0, eta - threshold))
             score = pref * pop * penalty
             if score > best_score:
                 best, best_score = r, score
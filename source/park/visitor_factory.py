@@ -1,9 +1,6 @@
 # source/park/visitor_factory.py
 from __future__ import annotations
 from abc import ABC, abstractmethod
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 from visitors.base import Visitor, Child, Tourist, AdrenalineAddict
 
 class VisitorCreator(ABC):
@@ -19,10 +16,9 @@ class VisitorCreator(ABC):
         Common logic shared by all creators — could be logging, counting, etc.
         Each concrete factory calls factory_method() to create the correct visitor.
         """
-        visitor = self.factory_method(vid, park, clock, metrics)
-        # Optional: log creation or keep stats
-        print(f"Factory created visitor: {visitor.profile['kind']}")
-        return visitor
+        # No per-visitor logging: the whole day's visitors are created up front,
+        # and ArrivalGenerator prints the type distribution once
+        return self.factory_method(vid, park, clock, metrics)
 
 class ChildCreator(VisitorCreator):
     def factory_method(self, vid, park, clock, metrics) -> Visitor:
@@ -1,14 +1,26 @@
 # source/visitors/base.py
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 from park.strategies import RandomStrategy, PreferenceStrategy, PopularityWaitTradeoff
-import threading
 import random
 
-class Visitor(threading.Thread):
+class Visitor:
+    """
+    A park guest, driven by the park's Scheduler instead of its own thread:
+    tick(now) does one decision and returns the minute of the next one.
+    """
+    __slots__ = (
+        "vid", "park", "clock", "metrics", "profile",
+        "ride_prefs", "strategy", "time_budget", "arrival_time", "departure_time",
+        "patience", "has_fastpass",
+        "hunger_level", "hunger_rate", "hunger_threshold", "is_eating", "food_preferences",
+        "_food_choices", "_current_ride", "_last_hunger_update", "_left", "scheduler",
+    )
+
+    # Per-type random ranges, drawn once per visitor in __init__
+    TIME_BUDGET = (180, 480)  # 3-8 hours in simulated minutes
+    PATIENCE = (15, 45)       # minutes willing to wait
+    FASTPASS_CHANCE = 0.2     # 20% chance of having fastpass
+
     def __init__(self, vid, park, clock, metrics):
-        super().__init__(daemon=True)
         self.vid = vid
         self.park = park
         self.clock = clock
@@ -23,11 +35,11 @@ class Visitor(threading.Thread):
         # Default preferences and behavior
         self.ride_prefs = {}
         self.strategy = RandomStrategy()  # default; subclasses can override
-        self.time_budget = random.randint(180, 480)  # 3-8 hours in simulated minutes
+        self.time_budget = random.randint(*self.TIME_BUDGET)
         self.arrival_time = None  # Will be set when visitor starts
         self.departure_time = None  # Will be calculated from arrival_time + time_budget
-        self.patience = random.randint(15, 45)  # minutes willing to wait
-        self.has_fastpass = random.random() < 0.2  # 20% chance of having fastpass
+        self.patience = random.randint(*self.PATIENCE)
+        self.has_fastpass = random.random() < self.FASTPASS_CHANCE
         
         # Hunger mechanics
         self.hunger_level = 0  # 0-100 scale
@@ -35,33 +47,38 @@ class Visitor(threading.Thread):
         self.hunger_threshold = 40  # when to seek food (lowered for testing)
         self.is_eating = False
         self.food_preferences = []  # list of preferred food facilities
+        self._food_choices = None   # (facilities list, candidates), built on first use
         
         # State tracking
         self._current_ride = None
-        self._ride_event = threading.Event()
+        self._last_hunger_update = None
+        self._left = False
+        self.scheduler = None  # set by Scheduler.add()
 
-    def choose_and_queue(self):
+    def choose_and_queue(self) -> int:
+        """Join a ride queue; returns extra minutes spent when no ride was available."""
         ride = self.strategy.pick_ride(self, self.park)
         if ride:
             self.park.join_ride_queue(self, ride)
-        else:
-            # fallback: rest/eat/wander
-            self.clock.sleep_minutes(random.randint(1, 5))
+            return 0
+        # fallback: rest/eat/wander
+        return random.randint(1, 5)
 
     def on_ride_finished(self, ride_name, sim_minute):
         """Called by the ride when this visitor's cycle completes."""
         self._current_ride = None
-        self._ride_event.set()
 
     def on_food_served(self, facility_name, sim_minute):
         """Called by food facility when order is complete."""
         self.hunger_level = 0  # Reset hunger
         self.is_eating = False
 
-    def update_hunger(self):
-        """Increase hunger over time."""
-        if not self.is_eating:
-            self.hunger_level = min(100, self.hunger_level + self.hunger_rate)
+    def _advance_hunger(self, now: int):
+        """Increase hunger for the minutes elapsed since the last update (not while eating)."""
+        minutes_elapsed = now - self._last_hunger_update
+        if minutes_elapsed > 0 and not self.is_eating:
+            self.hunger_level = min(100, self.hunger_level + (self.hunger_rate * minutes_elapsed))
+            self._last_hunger_update = now
 
     def should_eat(self) -> bool:
         """Determine if visitor should seek food."""
@@ -73,57 +90,61 @@ class Visitor(threading.Thread):
         if not facilities:
             return False
 
-        # Prefer certain facilities if specified
-        if self.food_preferences:
+        # Prefer certain facilities if specified; the park's list is fixed once built
+        if self._food_choices is None or self._food_choices[0] is not facilities:
             preferred = [f for f in facilities if f.name in self.food_preferences]
-            if preferred:
-                facilities = preferred
+            self._food_choices = (facilities, preferred or facilities)
 
         # Pick randomly from available facilities
-        facility = random.choice(facilities)
+        facility = random.choice(self._food_choices[1])
         self.is_eating = True
         success = self.park.join_food_queue(self, facility)
         if not success:
             self.is_eating = False
         return success
 
-    def run(self):
-        # Set arrival and planned departure time
-        self.arrival_time = self.clock.now()
-        self.departure_time = self.arrival_time + self.time_budget
-        
-        last_hunger_update = self.clock.now()
-        while not self.clock.should_stop():
-            current_time = self.clock.now()
-            
-            # Check if it's time to leave
-            if current_time >= self.departure_time:
-                break
-            
-            # Update hunger based on time elapsed
-            minutes_elapsed = current_time - last_hunger_update
-            if minutes_elapsed > 0 and not self.is_eating:
-                self.hunger_level = min(100, self.hunger_level + (self.hunger_rate * minutes_elapsed))
-                last_hunger_update = current_time
-
-            # Decide action: eat or ride
-            if self.should_eat():
-                self.seek_food()
-                # Rest while eating/waiting for food
-                self.clock.sleep_minutes(random.randint(2, 5))
-            else:
-                # Go on rides
-                self.choose_and_queue()
-                self.clock.sleep_minutes(random.randint(1, 3))
-        
+    # ---- Scheduler task ----
+    def tick(self, now: int):
+        """One decision; returns the minute of the next one (None once the visitor left)."""
+        if self.arrival_time is None:
+            # Set arrival and planned departure time
+            self.arrival_time = now
+            self.departure_time = now + self.time_budget
+            self._last_hunger_update = now
+
+        # Check if it's time to leave
+        if now >= self.departure_time:
+            self._leave(now)
+            return None
+
+        # Update hunger based on time elapsed
+        self._advance_hunger(now)
+
+        # Decide action: eat or ride
+        if self.should_eat():
+            self.seek_food()
+            # Rest while eating/waiting for food
+            return now + random.randint(2, 5)
+        # Go on rides
+        return now + self.choose_and_queue() + random.randint(1, 3)
+
+    def shutdown(self, now: int):
+        # park closes: everyone still inside leaves now
+        self._leave(now)
+
+    def _leave(self, now: int):
+        if self._left:
+            return
+        self._left = True
         # Exit park
         if self.metrics:
-            try:
-                self.metrics.record_exit(self.vid, self.clock.now(), reason="time_up")
-            except Exception:
-                pass
+            self.metrics.record_exit(self.vid, now, reason="time_up")
 
 class Child(Visitor):
+    __slots__ = ()
+    PATIENCE = (10, 25)       # Kids are less patient
+    TIME_BUDGET = (120, 240)  # Children stay for shorter periods (2-4 hours max)
+
     def __init__(self, vid, park, clock, metrics):
         super().__init__(vid, park, clock, metrics)
         self.profile["kind"] = "Child"
@@ -135,17 +156,16 @@ class Child(Visitor):
             "HauntedHouse": 0.7,
         }
         self.strategy = PreferenceStrategy()
-        self.patience = random.randint(10, 25)  # Kids are less patient
-        
-        # Children stay for shorter periods (2-4 hours)
-        self.time_budget = random.randint(120, 240)  # 2-4 hours max
-        
+
         # Children get hungrier faster and prefer ice cream
         self.hunger_rate = 1.5  # Very hungry kids!
         self.hunger_threshold = 30  # Get hungry sooner
         self.food_preferences = ["IceCreamStand"]  # Kids love ice cream!
 
 class Tourist(Visitor):
+    __slots__ = ()
+    TIME_BUDGET = (240, 420)  # Tourists stay moderate to long periods (4-7 hours)
+
     def __init__(self, vid, park, clock, metrics):
         super().__init__(vid, park, clock, metrics)
         self.profile["kind"] = "Tourist"
@@ -157,16 +177,17 @@ class Tourist(Visitor):
             "HauntedHouse": 0.8,
         }
         self.strategy = RandomStrategy()
-        
-        # Tourists stay moderate to long periods (4-7 hours)
-        self.time_budget = random.randint(240, 420)  # 4-7 hours
-        
+
         # Tourists have moderate hunger and like full meals
         self.hunger_rate = 1.0
         self.hunger_threshold = 65
         self.food_preferences = ["BurgerTruck"]  # Prefer substantial meals
 
 class AdrenalineAddict(Visitor):
+    __slots__ = ()
+    FASTPASS_CHANCE = 0.4     # Higher chance of fastpass (40%)
+    TIME_BUDGET = (480, 600)  # 8-10 hours (stays until closing)
+
     def __init__(self, vid, park, clock, metrics):
         super().__init__(vid, park, clock, metrics)
         self.profile["kind"] = "AdrenalineAddict"
@@ -180,11 +201,7 @@ class AdrenalineAddict(Visitor):
             "PirateShip": 1.0,
         }
         self.strategy = PopularityWaitTradeoff(wait_penalty_after=8)
-        self.has_fastpass = random.random() < 0.4  # Higher chance of fastpass (40%)
-        
-        # Adrenaline addicts stay until park closing (8-10 hours, essentially until close)
-        self.time_budget = random.randint(480, 600)  # 8-10 hours (stays until closing)
-        
+
         # Adrenaline junkies ignore hunger longer, quick snacks only
         self.hunger_rate = 0.3  # Get hungry slower (focused on rides)
         self.hunger_threshold = 75  # Only eat when very hungry
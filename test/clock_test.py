@@ -1,12 +1,19 @@
-from source.core import Clock, pick_weighted, Status
+import threading
+
+from source.core import Clock, pick_weighted, make_picker, Status
 
 clock = Clock(speed_factor=0.2, open_minutes=10)
 print("Starting test...")
+# sleep_minutes only waits; run_until_close is what moves the clock
+threading.Thread(target=clock.run_until_close, daemon=True).start()
 clock.sleep_minutes(5)
 print("Current minute:", clock.now())
+assert clock.now() >= 5
 
 items = ["A", "B", "C"]
 weights = [0.6, 0.3, 0.1]
 print("Weighted pick:", pick_weighted(items, weights))
+# all-zero weights: both pickers fall back to the last item
+assert pick_weighted(items, [0, 0, 0]) == make_picker(items, [0, 0, 0])() == "C"
 
 print("Status example:", Status.OPEN)
@@ -1,6 +1,7 @@
 
 import time
 import threading
+from collections import deque
 from concurrent.futures import ThreadPoolExecutor
 
 from food import BurgerTruck, IceCreamStand
@@ -23,8 +24,11 @@ class DummyClock:
 class FoodQueue:
     def __init__(self, cap=1000):
         self._cap = cap
-        self._q = []
+        self._q = deque()
         self._lock = threading.Lock()
+    # Producers (several pool threads) take the lock so the capacity check and
+    # append stay together; the single consumer (the driver) pops lock-free:
+    # deque.append/popleft are atomic and producers only ever add items.
     def enqueue(self, visitor, now_minute=0):
         with self._lock:
             if len(self._q) >= self._cap:
@@ -32,11 +36,14 @@ class FoodQueue:
             self._q.append(type("Item", (), {"obj": visitor, "enq_min": now_minute})())
             return True
     def dequeue(self):
-        with self._lock:
-            return self._q.pop(0) if self._q else None
+        try:
+            return self._q.popleft()
+        except IndexError:
+            return None
+    def get_batch(self, n):
+        return [self._q.popleft() for _ in range(min(max(0, n), len(self._q)))]
     def size(self):
-        with self._lock:
-            return len(self._q)
+        return len(self._q)  # len() of a deque is atomic
 
 class Visitor:
     def __init__(self, vid):
@@ -49,6 +56,9 @@ class DummyMetrics:
         print(f"METRIC order v{vid} -> {name} at {minute}")
     def record_served(self, vid, name, minute):
         print(f"METRIC served v{vid} <- {name} at {minute}")
+    def record_batch(self, events):
+        for event, vid, name, minute in events:
+            getattr(self, f"record_{event}")(vid, name, minute)
 
 def main():
     clock = DummyClock(total_minutes=25)
@@ -62,8 +72,17 @@ def main():
     ice = IceCreamStand(name="IceCreamStand", service_time=(2,5), capacity=8,
                         order_queue=ice_q, clock=clock, metrics=metrics)
 
-    burger.start()
-    ice.start()
+    def drive():
+        while not clock.should_stop():
+            now = clock.now()
+            burger.tick(now)
+            ice.tick(now)
+            clock.sleep_minutes(1)
+        burger.shutdown(clock.now())
+        ice.shutdown(clock.now())
+
+    driver = threading.Thread(target=drive, daemon=True)
+    driver.start()
 
     def enqueue_to(q, start_vid, count):
         for i in range(count):
@@ -79,8 +98,7 @@ def main():
         pool.submit(enqueue_to, burger_q, 1000, 8)
         pool.submit(enqueue_to, ice_q, 200, 6)
 
-    burger.join()
-    ice.join()
+    driver.join()
     print("Done.")
 
 if __name__ == "__main__":
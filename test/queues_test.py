@@ -0,0 +1,105 @@
+import time
+
+from source.facilities.queues import QueueItem, RideQueue, ServiceQueue
+
+
+class Guest:
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return self.name
+
+
+def names(items):
+    return [item.obj.name for item in items]
+
+
+# --- RideQueue: FIFO inside each lane, fairness rule across lanes ---
+q = RideQueue(support_priority=True)
+r1, r2, r3, p1, p2 = (Guest(n) for n in ("r1", "r2", "r3", "p1", "p2"))
+for guest, pri in ((r1, False), (p1, True), (r2, False), (p2, True), (r3, False)):
+    assert q.enqueue(guest, 0, priority=pri)
+print("Lengths:", q.len_regular(), q.len_priority())
+batch = q.get_batch_for_boarding(5)
+print("Boarding order:", names(batch))
+assert names(batch) == ["p1", "r1", "r2", "r3", "p2"]
+assert q.size() == 0
+
+# --- already queued keeps its place and returns True ---
+a, b = Guest("a"), Guest("b")
+q.enqueue(a, 1)
+q.enqueue(b, 2)
+assert q.enqueue(a, 3) is True
+assert q.enqueue(a, 4, priority=True) is True  # no lane hopping either
+assert (q.len_regular(), q.len_priority()) == (2, 0)
+batch = q.get_batch_for_boarding(2)
+assert names(batch) == ["a", "b"] and batch[0].enq_minute == 1
+print("Re-enqueue keeps place:", names(batch))
+
+# --- released items are not reused while the caller still holds them ---
+held = batch
+fresh = [Guest(f"f{i}") for i in range(10)]
+for guest in fresh:
+    q.enqueue(guest, 5)
+boarded = q.get_batch_for_boarding(10)
+assert not any(item is h for item in boarded for h in held)
+assert names(held) == ["a", "b"]  # untouched by the later enqueues
+for item in held:
+    item.release()
+assert held[0].obj is None and held[0] in QueueItem._pool
+for item in boarded:
+    item.release()
+print("Held items were not recycled")
+
+# --- enqueue / remove / get_batch_for_boarding interleaved ---
+q = RideQueue(support_priority=True, max_regular=3)
+a, b, c, d, e = (Guest(n) for n in "abcde")
+q.enqueue(a, 0)
+q.enqueue(b, 0)
+q.enqueue(c, 0)
+assert q.enqueue(d, 0) is False  # regular lane is full
+assert q.remove(b) is True
+assert q.remove(b) is False
+assert q.enqueue(d, 1) is True  # the freed spot goes to the back
+q.enqueue(e, 1, priority=True)
+assert names(q.get_batch_for_boarding(2)) == ["e", "a"]
+assert q.remove(a) is False  # already boarded
+assert names(q.get_batch_for_boarding(10)) == ["c", "d"]
+print("Interleaved RideQueue ops OK")
+
+# --- the one-shot wake-up fires on the next enqueue only ---
+woken = []
+assert q.notify_when_nonempty(lambda: woken.append(1))
+q.enqueue(a, 2)
+q.enqueue(b, 2)
+assert woken == [1]
+assert q.notify_when_nonempty(lambda: woken.append(2)) is False  # not empty
+
+# --- remove is O(1): drop everyone from the back of a long line ---
+q = RideQueue()
+crowd = [Guest(str(i)) for i in range(50000)]
+for guest in crowd:
+    q.enqueue(guest, 0)
+start = time.perf_counter()
+for guest in reversed(crowd):
+    q.remove(guest)
+elapsed = time.perf_counter() - start
+print(f"Removed {len(crowd)} guests in {elapsed:.3f}s")
+assert q.size() == 0 and elapsed < 1.0
+
+# --- ServiceQueue: FIFO, re-enqueue, remove and get_batch ---
+s = ServiceQueue(max_size=3)
+a, b, c, d = (Guest(n) for n in "abcd")
+assert s.enqueue(a, 0) and s.enqueue(b, 0) and s.enqueue(c, 0)
+assert s.enqueue(a, 1) is True and s.size() == 3  # keeps its place
+assert s.enqueue(d, 1) is False  # full
+assert s.remove(b) is True and s.remove(b) is False
+assert s.enqueue(d, 2) is True
+first = s.get_batch(2)
+assert names(first) == ["a", "c"]
+assert names(s.get_batch(10)) == ["d"] and s.get_batch(1) == []
+assert s.get_next(block=False, clock=None) is None
+print("ServiceQueue order:", names(first) + ["d"])
+
+print("All queue checks passed.")
@@ -0,0 +1,82 @@
+from source.core import Clock
+from source.park.scheduler import Scheduler
+
+
+def run_day(clock):
+    scheduler = Scheduler(clock)
+    seen = []
+
+    def every_minute(now):
+        seen.append(now)
+        return now + 1
+
+    scheduler.schedule_at(0, every_minute)
+    scheduler.start()
+    clock.run_until_close()
+    clock.stop()
+    scheduler.join(timeout=5)
+    return seen
+
+
+clock = Clock(speed_factor=0.001, open_minutes=60)
+print("Starting real-time test...")
+seen = run_day(clock)
+missing = sorted(set(range(60)) - set(seen))
+print("Minutes dispatched:", len(seen), "missing:", missing)
+assert seen == list(range(60))
+
+# virtual mode: the clock does not wait for the wall clock, only for the scheduler
+clock = Clock(speed_factor=0, open_minutes=660)
+print("Starting virtual test...")
+seen = run_day(clock)
+missing = sorted(set(range(660)) - set(seen))
+print("Minutes dispatched:", len(seen), "missing:", missing)
+assert seen == list(range(660))
+
+
+# fast-forward: with only sparse callbacks the loop sleeps until the next due
+# minute, but a callback scheduled from another thread still runs on time
+import threading
+
+clock = Clock(speed_factor=0.001, open_minutes=60)
+scheduler = Scheduler(clock)
+sparse, late = [], []
+scheduler.schedule_at(0, lambda now: sparse.append(now) or (now + 20))
+
+
+def from_other_thread():
+    clock.sleep_minutes(7)
+    due = clock.now()
+    scheduler.schedule_at(due, lambda now: late.append((due, now)))
+
+
+print("Starting fast-forward test...")
+threading.Thread(target=from_other_thread, daemon=True).start()
+scheduler.start()
+clock.run_until_close()
+clock.stop()
+scheduler.join(timeout=5)
+print("Sparse minutes:", sparse, "cross-thread (due, ran):", late)
+assert sparse == [0, 20, 40]
+assert len(late) == 1 and late[0][0] <= late[0][1] < 20  # not held until the next timer
+
+
+# a failing callback is reported once and dropped, not retried every minute
+clock = Clock(speed_factor=0, open_minutes=30)
+scheduler = Scheduler(clock)
+calls = []
+
+
+def broken(now):
+    calls.append(now)
+    raise RuntimeError("boom")
+
+
+print("Starting failing-callback test (one traceback expected)...")
+scheduler.schedule_at(3, broken)
+scheduler.start()
+clock.run_until_close()
+clock.stop()
+scheduler.join(timeout=5)
+print("Failing callback calls:", calls)
+assert calls == [3]